@@ -5,9 +5,15 @@ Controls the ESP32 Jarvis via Serial
 Text-to-speech and keyboard commands only
 
 This version works WITHOUT pyaudio/speechrecognition!
+
+Usage:
+    python3 jarvis-brain-test.py [port]                   - Interactive
+    python3 jarvis-brain-test.py [port] --script show.txt - Run a command script
+    cat show.txt | python3 jarvis-brain-test.py [port] --script -
 """
 
 import serial
+import sys
 import time
 import threading
 from datetime import datetime
@@ -20,9 +26,22 @@ except ImportError:
     TTS_AVAILABLE = False
     print("⚠️  pyttsx3 not installed - text-to-speech disabled")
 
+# Reply lines the firmware sends back for each command it understands
+# (handleBluetooth() in jarvis-complete.ino). Anything else gets no reply.
+EXPECTED_REPLIES = {
+    'face:idle': 1, 'face:happy': 1, 'face:excited': 1, 'face:thinking': 1,
+    'face:listening': 1, 'face:speaking': 1, 'face:scanning': 1,
+    'led on': 1, 'led off': 1,
+    'status': 2,
+}
+
+# Unsolicited keepalive lines - never count these as replies
+KEEPALIVE_LINES = ('JARVIS Ready', 'ESP32 Ready')
+
 class JarvisBrainTest:
     def __init__(self, port='/dev/cu.usbserial-0001', baudrate=115200):
         """Initialize Jarvis Brain test controller"""
+        global TTS_AVAILABLE
         self.port = port
         self.baudrate = baudrate
         self.serial = None
@@ -281,6 +300,174 @@ class JarvisBrainTest:
         self.send_command("face:idle")
         print("\n✅ Test sequence complete!\n")
     
+    def _read_lines(self, deadline):
+        """Read complete reply lines until `deadline`, keeping partial lines"""
+        lines = []
+        while True:
+            while b"\n" in self._script_buffer:
+                line, self._script_buffer = self._script_buffer.split(b"\n", 1)
+                text = line.decode(errors="replace").strip()
+                if text and text not in KEEPALIVE_LINES:
+                    lines.append(text)
+            if lines or time.monotonic() >= deadline:
+                return lines
+            self._script_buffer += self.serial.read(self.serial.in_waiting or 1)
+    
+    def _pump(self, deadline):
+        """Collect replies until `deadline`, crediting them against in-flight commands"""
+        lines = self._read_lines(deadline)
+        for line in lines:
+            self._script_events.append(line)
+            del self._script_events[:-100]
+            if self._in_flight:
+                self._in_flight -= 1
+                self._script_stats['replies'] += 1
+                self._last_reply = time.monotonic()
+            if self._script_verbose:
+                print(f"📥 ESP32: {line}")
+        return lines
+    
+    def _settle(self, limit, ack_timeout):
+        """Collect replies until no more than `limit` commands are unanswered"""
+        self._last_reply = time.monotonic()
+        while self._in_flight > limit:
+            self._pump(self._last_reply + ack_timeout)
+            if self._in_flight > limit and time.monotonic() - self._last_reply >= ack_timeout:
+                print(f"⚠️  {self._in_flight} reply(s) never arrived")
+                self._script_stats['lost'] += self._in_flight
+                self._in_flight = 0
+    
+    def _script_send(self, command, window, ack_timeout):
+        """Send one command, blocking only while the reply window is full"""
+        self._settle(window - 1, ack_timeout)
+        data = f"{command}\n".encode()
+        self.serial.write(data)
+        self._in_flight += EXPECTED_REPLIES.get(command, 0)
+        self._script_stats['commands'] += 1
+        self._script_stats['bytes'] += len(data)
+        if self._script_verbose:
+            print(f"📤 Sent: {command}")
+    
+    def _wait_for_event(self, text, timeout):
+        """Sync point: block until a device line containing `text` shows up
+        
+        Only lines collected since the wait-for step began count - replies to
+        commands still in flight at that point, plus anything newer.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            for i, line in enumerate(self._script_events):
+                if text.lower() in line.lower():
+                    del self._script_events[:i + 1]
+                    return True
+            self._script_events.clear()
+            if time.monotonic() >= deadline:
+                return False
+            self._pump(deadline)
+    
+    def run_script(self, lines, window=1, ack_timeout=3.0, verbose=False):
+        """Stream a command script to the ESP32 without the interactive sleeps
+        
+        Commands are pipelined with up to `window` unanswered replies in flight.
+        Only `say`, `wait`, `wait-for` and `sync` steps stop the stream.
+        Lines the firmware doesn't answer are rejected, not sent.
+        The firmware reads with SerialBT.readString(), which merges commands
+        that arrive within its 1 s timeout - keep `window` at 1 unless the
+        sketch frames commands by newline.
+        """
+        self.serial.timeout = 0.05
+        self._script_buffer = b""
+        self._script_events = []
+        self._script_verbose = verbose
+        self._in_flight = 0
+        self._last_reply = time.monotonic()
+        self._script_stats = {'steps': 0, 'rejected': 0, 'commands': 0,
+                              'bytes': 0, 'replies': 0, 'lost': 0}
+        waited = 0.0
+        
+        print(f"📜 Running script (window {window})...")
+        start = time.monotonic()
+        
+        for number, raw in enumerate(lines, 1):
+            line = raw.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            cmd_lower = line.lower()
+            
+            if cmd_lower.startswith('face '):
+                expression = cmd_lower[5:].strip()
+                if f"face:{expression}" not in EXPECTED_REPLIES:
+                    print(f"❌ Line {number}: invalid expression '{expression}'")
+                    self._script_stats['rejected'] += 1
+                    continue
+                self._script_send(f"face:{expression}", window, ack_timeout)
+            
+            elif cmd_lower.startswith('say '):
+                self._settle(0, ack_timeout)
+                began = time.monotonic()
+                self.speak(line[4:])
+                waited += time.monotonic() - began
+            
+            elif cmd_lower == 'sync':
+                self._settle(0, ack_timeout)
+            
+            elif cmd_lower.startswith('wait-for '):
+                parts = line[9:].rsplit(' ', 1)
+                text, timeout = line[9:], 30.0
+                if len(parts) == 2:
+                    try:
+                        text, timeout = parts[0], float(parts[1])
+                    except ValueError:
+                        pass
+                # Forget earlier lines so old replies can't satisfy this step
+                self._script_events.clear()
+                self._settle(0, ack_timeout)
+                began = time.monotonic()
+                if not self._wait_for_event(text, timeout):
+                    print(f"⚠️  Line {number}: timed out waiting for '{text}'")
+                waited += time.monotonic() - began
+            
+            elif cmd_lower.startswith('wait '):
+                try:
+                    seconds = float(cmd_lower[5:])
+                except ValueError:
+                    print(f"❌ Line {number}: bad wait '{line}'")
+                    self._script_stats['rejected'] += 1
+                    continue
+                self._settle(0, ack_timeout)
+                time.sleep(seconds)
+                waited += seconds
+            
+            elif cmd_lower in EXPECTED_REPLIES:
+                # led on/off, status and raw face:<expr>
+                self._script_send(cmd_lower, window, ack_timeout)
+            
+            else:
+                # The firmware stays silent on unknown commands, and readString()
+                # would merge them into the next one - never send them
+                print(f"❌ Line {number}: unknown command '{line}'")
+                self._script_stats['rejected'] += 1
+                continue
+            
+            self._script_stats['steps'] += 1
+        
+        self._settle(0, ack_timeout)
+        elapsed = time.monotonic() - start
+        stats = self._script_stats
+        active = max(elapsed - waited, 1e-9)
+        
+        print("\n📈 Script summary")
+        print(f"   Steps          {stats['steps']} run, {stats['rejected']} rejected")
+        print(f"   Commands sent  {stats['commands']} ({stats['bytes']} bytes)")
+        print(f"   Replies        {stats['replies']} received, {stats['lost']} lost")
+        print(f"   Elapsed        {elapsed:.2f}s ({waited:.2f}s in say/wait/wait-for)")
+        print(f"   Throughput     {stats['commands'] / active:.1f} cmd/s, "
+              f"{stats['bytes'] / active:.0f} bytes/s")
+        
+        stats.update(elapsed=elapsed, waited=waited)
+        return stats
+    
     def show_help(self):
         """Show available commands"""
         print("\n📋 JARVIS Brain Commands:")
@@ -312,10 +499,43 @@ class JarvisBrainTest:
 
 def main():
     """Main entry point"""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="JARVIS Brain - test mode")
+    parser.add_argument('port', nargs='?', default='/dev/cu.usbserial-0001')
+    parser.add_argument('--script', metavar='FILE',
+                        help="run commands from FILE ('-' for stdin) instead of the prompt")
+    parser.add_argument('--window', type=int, default=1,
+                        help="max unanswered commands in flight (default: 1)")
+    parser.add_argument('--ack-timeout', type=float, default=3.0,
+                        help="seconds to wait for a reply before counting it lost")
+    parser.add_argument('--verbose', action='store_true',
+                        help="print every command and reply in script mode")
+    args = parser.parse_args()
+    port = args.port
     
-    # Get port from command line or use default
-    port = sys.argv[1] if len(sys.argv) > 1 else '/dev/cu.usbserial-0001'
+    if args.script:
+        # Open the script first so a bad path fails before the 2s connect
+        try:
+            stream = sys.stdin if args.script == '-' else open(args.script)
+        except OSError as e:
+            print(f"❌ Can't open script: {e}")
+            sys.exit(1)
+        brain = JarvisBrainTest(port=port)
+        if not brain.connect():
+            if stream is not sys.stdin:
+                stream.close()
+            sys.exit(1)
+        try:
+            brain.run_script(stream, window=max(1, args.window),
+                             ack_timeout=args.ack_timeout, verbose=args.verbose)
+        except KeyboardInterrupt:
+            print("\n⚠️  Interrupted")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            brain.disconnect()
+        return
     
     print("="*60)
     print("🧪 JARVIS BRAIN - TEST MODE")
@@ -329,4 +549,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
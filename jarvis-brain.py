@@ -13,7 +13,131 @@ import time
 import threading
 import speech_recognition as sr
 import pyttsx3
-from datetime import datetime
+from datetime import date, datetime, timedelta
+
+class ResponseCache:
+    """Pre-rendered replies for predictable intents (time and date)
+
+    A background thread keeps phrases for the next few minutes and for
+    today/tomorrow ready. Answering is then an integer-keyed dictionary
+    lookup instead of strftime on the critical path. Each intent also
+    carries its face transitions, so JARVIS goes straight to speaking
+    instead of sending face:thinking first.
+    """
+
+    FACES = {
+        'time': ['face:speaking'],
+        'date': ['face:speaking'],
+    }
+
+    def __init__(self, minutes_ahead=3, refresh_interval=20):
+        self.minutes_ahead = minutes_ahead
+        self.refresh_interval = refresh_interval
+        # Keyed by epoch minute / date ordinal. refresh() swaps in whole new
+        # dicts, which is atomic, so lookups need no lock.
+        self.phrases = {intent: {} for intent in self.FACES}
+        self.running = False
+        self.stats = {intent: {'hits': 0, 'misses': 0} for intent in self.FACES}
+        self.face_rtts = {intent: [] for intent in self.FACES}
+
+    @staticmethod
+    def intent_for(command):
+        """Return the precomputable intent for a command, if any"""
+        if "time" in command or "what time" in command:
+            return 'time'
+        if "date" in command or "what day" in command:
+            return 'date'
+        return None
+
+    @staticmethod
+    def render(intent, now):
+        if intent == 'time':
+            return f"It's {now.strftime('%I:%M %p')}"
+        return f"Today is {now.strftime('%B %d, %Y')}"
+
+    @staticmethod
+    def _key(intent, timestamp):
+        if intent == 'time':
+            return int(timestamp // 60)
+        return date.fromtimestamp(timestamp).toordinal()
+
+    def refresh(self, now=None):
+        """Render phrases for upcoming minutes and days, drop stale ones"""
+        now = now or time.time()
+        minute = int(now // 60)
+        times = {}
+        for offset in range(self.minutes_ahead + 1):
+            moment = datetime.fromtimestamp((minute + offset) * 60)
+            times[minute + offset] = self.render('time', moment)
+        today = date.fromtimestamp(now)
+        dates = {}
+        for offset in range(2):
+            day = today + timedelta(days=offset)
+            dates[day.toordinal()] = self.render('date', day)
+        self.phrases = {'time': times, 'date': dates}
+
+    def _refresh_loop(self):
+        while self.running:
+            self.refresh()
+            time.sleep(self.refresh_interval)
+
+    def start(self):
+        """Fill the cache and keep it topped up in the background"""
+        self.refresh()
+        self.running = True
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    def lookup(self, intent):
+        """Return (faces, phrase) for an intent, rendering it on a miss"""
+        phrase = self.phrases[intent].get(self._key(intent, time.time()))
+        if phrase is None:
+            phrase = self.render(intent, datetime.now())
+            self.stats[intent]['misses'] += 1
+        else:
+            self.stats[intent]['hits'] += 1
+        return self.FACES[intent], phrase
+
+    def record_face_rtt(self, intent, seconds):
+        """Record a measured query -> 'Face: Speaking' reply time"""
+        rtts = self.face_rtts[intent]
+        rtts.append(seconds)
+        del rtts[:-50]
+
+    def benchmark(self, intent, rounds=2000):
+        """Average seconds per call for the cached path and a direct render"""
+        phrases = self.phrases[intent]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            phrases.get(self._key(intent, time.time()))
+        cached = (time.perf_counter() - start) / rounds
+        start = time.perf_counter()
+        for _ in range(rounds):
+            self.render(intent, datetime.now())
+        direct = (time.perf_counter() - start) / rounds
+        return cached, direct
+
+    def report(self):
+        """Print hit rate, lookup cost and measured face latency per intent"""
+        print("\n📊 Precomputed responses:")
+        for intent, stats in self.stats.items():
+            total = stats['hits'] + stats['misses']
+            if not total:
+                print(f"  {intent:<5} no queries yet")
+                continue
+            cached, direct = self.benchmark(intent)
+            print(f"  {intent:<5} {stats['hits']}/{total} hits "
+                  f"({stats['hits'] / total:.0%}), lookup {cached * 1e6:.2f} µs "
+                  f"vs render {direct * 1e6:.2f} µs")
+            rtts = sorted(self.face_rtts[intent])
+            if rtts:
+                print(f"        query -> Face: Speaking {rtts[len(rtts) // 2] * 1000:.0f} ms "
+                      f"(median of {len(rtts)})")
+            else:
+                print("        query -> Face: Speaking not measured yet")
+        print()
 
 class JarvisBrain:
     def __init__(self, port='/dev/cu.usbserial-0001', baudrate=115200):
@@ -34,6 +158,10 @@ class JarvisBrain:
         # Wake word
         self.wake_word = "jarvis"
         self.listening = False
+        self.speaking_sent = None
+        
+        # Precomputed time/date replies
+        self.responses = ResponseCache()
         
         print("🤖 JARVIS Brain Initializing...")
         
@@ -134,22 +262,24 @@ class JarvisBrain:
     
     def process_command(self, command):
         """Process voice commands"""
-        self.send_command("face:thinking")
-        
-        # Time commands
-        if "time" in command or "what time" in command:
-            current_time = datetime.now().strftime("%I:%M %p")
-            self.send_command("face:speaking")
-            self.speak(f"It's {current_time}")
+        # Time/date replies are precomputed - answer without thinking
+        intent = self.responses.intent_for(command)
+        if intent:
+            # Timed until the ESP32 confirms the speaking face (monitor_serial)
+            self.speaking_sent = (intent, time.monotonic())
+            faces, phrase = self.responses.lookup(intent)
+            for face in faces:
+                self.send_command(face)
+            self.speak(phrase)
+            time.sleep(1)
+            self.send_command("face:idle")
+            return
         
-        # Date commands
-        elif "date" in command or "what day" in command:
-            current_date = datetime.now().strftime("%B %d, %Y")
-            self.send_command("face:speaking")
-            self.speak(f"Today is {current_date}")
+        self.speaking_sent = None
+        self.send_command("face:thinking")
         
         # LED control
-        elif "lights on" in command or "led on" in command:
+        if "lights on" in command or "led on" in command:
             self.send_command("led on")
             self.send_command("face:happy")
             self.speak("Lights on")
@@ -197,6 +327,15 @@ class JarvisBrain:
         while self.running:
             response = self.read_response()
             if response:
+                # Time precomputed answers from query to the speaking face
+                sent = self.speaking_sent
+                if response == "Face: Speaking" and sent:
+                    intent, started = sent
+                    elapsed = time.monotonic() - started
+                    # Ignore replies too late to belong to this query
+                    if elapsed < 5:
+                        self.responses.record_face_rtt(intent, elapsed)
+                    self.speaking_sent = None
                 # Process ESP32 messages
                 if "audio level" in response.lower():
                     # Could trigger face reactions based on audio
@@ -209,6 +348,7 @@ class JarvisBrain:
             return
         
         self.running = True
+        self.responses.start()
         
         # Start serial monitor thread
         serial_thread = threading.Thread(target=self.monitor_serial, daemon=True)
@@ -239,6 +379,8 @@ class JarvisBrain:
                     break
                 elif user_input == 'help':
                     self.show_help()
+                elif user_input == 'responses':
+                    self.responses.report()
                 elif user_input.startswith('say '):
                     text = user_input[4:]
                     self.speak(text)
@@ -258,6 +400,8 @@ class JarvisBrain:
             print("\n⚠️  Interrupted")
         finally:
             self.running = False
+            self.responses.stop()
+            self.responses.report()
             self.send_command("face:idle")
             self.disconnect()
             print("👋 JARVIS Brain shutting down...")
@@ -271,6 +415,7 @@ class JarvisBrain:
         print("    face <expr>    - Change face (idle/happy/excited/thinking/listening/speaking/scanning)")
         print("    led on/off     - Control LED")
         print("    status         - Get ESP32 status")
+        print("    responses      - Show precomputed reply hit rate")
         print("    help           - Show this help")
         print("    quit           - Exit program")
         print()
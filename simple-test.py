@@ -2,25 +2,389 @@
 """
 Simple JARVIS Test - No dependencies required!
 Uses only Python built-in libraries
+
+Usage:
+    python3 simple-test.py [port]          - Quick connection test
+    python3 simple-test.py --diag [port]   - Link diagnostics (latency, rate, errors)
+    python3 simple-test.py --diag pty      - Diagnostics against a local pty stand-in
 """
 
+import math
+import os
 import sys
+import threading
+import time
 
-def main():
-    print("="*60)
-    print("🧪 JARVIS CONNECTION TEST")
-    print("="*60)
+# The firmware answers every face command with a fixed line, so face:idle
+# works as a ping without changing what's on the OLED.
+PING_COMMAND = "face:idle"
+PING_REPLY = "Face: Idle"
+
+# Unsolicited lines the sketches print on their own (Bluetooth keepalive)
+KEEPALIVE_LINES = ("JARVIS Ready", "ESP32 Ready")
+
+# Arduino's Stream default - SerialBT.readString() waits this long for more bytes
+ARDUINO_STREAM_TIMEOUT = 1.0
+
+
+class PtyStandIn:
+    """Local pseudo-terminal that answers like jarvis-complete.ino
+
+    Mimics handleBluetooth(): bytes are collected until no new byte shows up
+    for `readstring_timeout` seconds (like SerialBT.readString()), then the
+    trimmed message is matched against the known commands.
+    """
+
+    REPLIES = {
+        "face:idle": "Face: Idle",
+        "face:happy": "Face: Happy",
+        "face:excited": "Face: Excited",
+        "face:thinking": "Face: Thinking",
+        "face:listening": "Face: Listening",
+        "face:speaking": "Face: Speaking",
+        "face:scanning": "Face: Scanning",
+        "led on": "LED ON",
+        "led off": "LED OFF",
+    }
+
+    def __init__(self, readstring_timeout=ARDUINO_STREAM_TIMEOUT):
+        import pty
+        import tty
+        self.readstring_timeout = readstring_timeout
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.started = time.monotonic()
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _reply(self, msg):
+        msg = msg.strip()
+        if msg in self.REPLIES:
+            return self.REPLIES[msg] + "\r\n"
+        if msg == "status":
+            uptime = int(time.monotonic() - self.started)
+            return f"Uptime: {uptime}s\r\nAudio: 0\r\n"
+        return ""
+
+    def _serve(self):
+        import select
+        buffer = b""
+        last_byte = None
+        while self.running:
+            wait = 0.05
+            if buffer:
+                wait = max(0.0, last_byte + self.readstring_timeout - time.monotonic())
+            try:
+                ready, _, _ = select.select([self.master], [], [], wait)
+                if ready:
+                    buffer += os.read(self.master, 1024)
+                    last_byte = time.monotonic()
+                elif buffer:
+                    reply = self._reply(buffer.decode(errors="replace"))
+                    buffer = b""
+                    if reply:
+                        os.write(self.master, reply.encode())
+            except OSError:
+                break
+
+    def close(self):
+        self.running = False
+        self.thread.join(timeout=1)
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(max(1, math.ceil(pct / 100 * len(ordered))), len(ordered))
+    return ordered[rank - 1]
+
+
+class ReplyReader:
+    """Line reader that keeps partial lines between calls
+
+    Skips the keepalive chatter so only command replies come back.
+    """
+
+    def __init__(self, ser):
+        self.ser = ser
+        self.buffer = b""
+
+    def reset(self):
+        self.ser.reset_input_buffer()
+        self.buffer = b""
+
+    def readline(self, deadline):
+        """Return the next reply line, or None if `deadline` passes first"""
+        while True:
+            while b"\n" in self.buffer:
+                line, self.buffer = self.buffer.split(b"\n", 1)
+                text = line.decode(errors="replace").strip()
+                if text and text not in KEEPALIVE_LINES:
+                    return text
+            if time.monotonic() >= deadline:
+                return None
+            self.buffer += self.ser.read(self.ser.in_waiting or 1)
+
+
+class LinkStats:
+    """Byte/line error counters for ping replies"""
+
+    def __init__(self):
+        self.expected_bytes = 0
+        self.bad_bytes = 0
+        self.replies = 0
+        self.bad_replies = 0
+        self.lost = 0
+
+    def check(self, reply):
+        expected = PING_REPLY
+        self.expected_bytes += len(expected)
+        if reply is None:
+            self.lost += 1
+            self.bad_bytes += len(expected)
+            return
+        self.replies += 1
+        mismatched = sum(1 for a, b in zip(reply, expected) if a != b)
+        mismatched += abs(len(reply) - len(expected))
+        if mismatched:
+            self.bad_replies += 1
+        self.bad_bytes += mismatched
+
+    @property
+    def byte_error_rate(self):
+        if not self.expected_bytes:
+            return 0.0
+        return self.bad_bytes / self.expected_bytes
+
+
+def ping(reader, timeout):
+    """Send one ping and return (rtt_seconds or None, reply)"""
+    reader.reset()
+    start = time.monotonic()
+    reader.ser.write(f"{PING_COMMAND}\n".encode())
+    reader.ser.flush()
+    reply = reader.readline(start + timeout)
+    if reply is None:
+        return None, None
+    return time.monotonic() - start, reply
+
+
+def burst(reader, rate, count, timeout):
+    """Send `count` pings at `rate` Hz without waiting, collect the replies
+
+    Returns (latencies, replies). Latency is measured from each send to the
+    matching (in-order) reply, so a growing value means replies are lagging.
+    Once the firmware merges commands, replies no longer line up with sends -
+    callers should only trust the latencies when every reply came back.
+    """
+    reader.reset()
+    interval = 1.0 / rate
+    sent = []
+    replies = []
+    latencies = []
+
+    def collect(reply):
+        # Late replies from an earlier step have no send to match against
+        if reply is not None and len(replies) < len(sent):
+            latencies.append(time.monotonic() - sent[len(replies)])
+            replies.append(reply)
+
+    start = time.monotonic()
+    for i in range(count):
+        target = start + i * interval
+        while True:
+            now = time.monotonic()
+            if now >= target:
+                break
+            collect(reader.readline(min(target, now + 0.01)))
+        sent.append(time.monotonic())
+        reader.ser.write(f"{PING_COMMAND}\n".encode())
+        reader.ser.flush()
+    deadline = sent[-1] + timeout
+    while len(replies) < count:
+        reply = reader.readline(deadline)
+        if reply is None:
+            break
+        collect(reply)
+    return latencies, replies
+
+
+def sweep_step(reader, stats, rate, burst_size, timeout, max_latency):
+    """Run one burst at `rate` and print it; True if replies kept up"""
+    latencies, replies = burst(reader, rate, burst_size, timeout)
+    # Dropped burst replies are the firmware merging commands, not line noise
+    for reply in replies:
+        stats.check(reply)
+    dropped = burst_size - len(replies)
+    if dropped:
+        print(f"   {rate:8.2f} cmd/s  {len(replies):2d}/{burst_size} replies  "
+              f"{dropped} dropped  ❌ lagging")
+        return False
+    worst = max(latencies)
+    lagging = latencies[-1] > max_latency
+    print(f"   {rate:8.2f} cmd/s  {len(replies):2d}/{burst_size} replies  "
+          f"worst {worst * 1000:8.1f} ms  {'❌ lagging' if lagging else '✅'}")
+    return not lagging
+
+
+def run_diagnostics(ser, baudrate=115200, warmup=3, count=20, burst_size=8,
+                    timeout=3.0, refine_steps=4):
+    """Warm up the link, then measure latency, rate limits and errors"""
+    reader = ReplyReader(ser)
+    print("\n🔥 Warm-up...")
+    for _ in range(warmup):
+        ping(reader, timeout)
+
+    print(f"🏓 Ping/echo: {count} x '{PING_COMMAND}'")
+    stats = LinkStats()
+    rtts = []
+    for i in range(count):
+        rtt, reply = ping(reader, timeout)
+        stats.check(reply)
+        if rtt is not None:
+            rtts.append(rtt)
+        print(f"   {i + 1:3d}: " + (f"{rtt * 1000:8.1f} ms" if rtt is not None else "   lost"),
+              end="\r")
     print()
-    
-    # Try to import serial
+
+    if not rtts:
+        print("❌ No replies - is jarvis-complete.ino running and the port correct?")
+        return None
+
+    p50 = percentile(rtts, 50)
+    print("\n📊 Round-trip latency")
+    for pct in (50, 90, 95, 99):
+        print(f"   p{pct:<3d} {percentile(rtts, pct) * 1000:8.1f} ms")
+    print(f"   min  {min(rtts) * 1000:8.1f} ms")
+    print(f"   max  {max(rtts) * 1000:8.1f} ms")
+
+    # Time the bytes themselves need on the wire (8N1 = 10 bits per byte)
+    wire_bytes = len(PING_COMMAND) + 1 + len(PING_REPLY) + 2
+    wire_time = wire_bytes * 10 / baudrate
+    overhead = max(0.0, p50 - wire_time)
+    print("\n⏳ readString() timeout overhead")
+    print(f"   wire time {wire_time * 1000:7.2f} ms for {wire_bytes} bytes @ {baudrate} baud")
+    print(f"   overhead  {overhead * 1000:7.1f} ms per command")
+    if overhead >= ARDUINO_STREAM_TIMEOUT * 0.8:
+        print("   💡 Most of the latency is SerialBT.readString() waiting for its")
+        print("      timeout - readStringUntil('\\n') would reply immediately")
+
+    # Step the send rate up until replies stop keeping up, then narrow it down
+    print(f"\n🚀 Rate sweep ({burst_size} pings per step)")
+    max_latency = 2 * percentile(rtts, 95)
+    rate = 0.5 / p50
+    sustainable = None
+    lagging_rate = None
+    while rate <= 1000:
+        if not sweep_step(reader, stats, rate, burst_size, timeout + p50, max_latency):
+            lagging_rate = rate
+            break
+        sustainable = rate
+        rate *= 2
+
+    if lagging_rate:
+        low = sustainable or 0.0
+        for _ in range(refine_steps):
+            rate = (low + lagging_rate) / 2
+            if sweep_step(reader, stats, rate, burst_size, timeout + p50, max_latency):
+                low = sustainable = rate
+            else:
+                lagging_rate = rate
+
+    print("\n📈 Summary")
+    print(f"   RTT p50/p95/p99   {p50 * 1000:.1f} / {percentile(rtts, 95) * 1000:.1f} / "
+          f"{percentile(rtts, 99) * 1000:.1f} ms")
+    if sustainable:
+        print(f"   Sustainable rate  {sustainable:.2f} cmd/s")
+    else:
+        print("   Sustainable rate  below the slowest tested rate")
+    print(f"   Lost replies      {stats.lost}")
+    print(f"   Corrupt replies   {stats.bad_replies}/{stats.replies}")
+    print(f"   Byte error rate   {stats.byte_error_rate:.4%}")
+    print(f"   readString() cost {overhead * 1000:.1f} ms/command")
+
+    return {
+        "rtt_p50": p50,
+        "rtt_p95": percentile(rtts, 95),
+        "rtt_p99": percentile(rtts, 99),
+        "sustainable_rate": sustainable,
+        "byte_error_rate": stats.byte_error_rate,
+        "readstring_overhead": overhead,
+    }
+
+
+def check_pyserial():
+    """Report whether pyserial is importable, with an install hint if not"""
     try:
         import serial
         print("✅ pyserial is installed")
-        serial_available = True
+        return True
     except ImportError:
         print("❌ pyserial is NOT installed")
         print("   Install with: pip3 install --user pyserial")
-        serial_available = False
+        return False
+
+
+def diagnostics(port):
+    """Run link diagnostics against a serial port or the pty stand-in"""
+    print("="*60)
+    print("🩺 JARVIS LINK DIAGNOSTICS")
+    print("="*60)
+
+    if not check_pyserial():
+        print("\n❌ Cannot run diagnostics without pyserial")
+        return
+
+    import serial
+
+    stand_in = None
+    if port == "pty":
+        stand_in = PtyStandIn()
+        port = stand_in.port
+        print(f"🧪 Using local pty stand-in: {port}")
+        print(f"   (readString() timeout {stand_in.readstring_timeout:.1f}s, like the firmware)")
+
+    print(f"📡 Connecting to: {port}")
+    try:
+        ser = serial.Serial(port, 115200, timeout=0.05)
+    except serial.SerialException as e:
+        print(f"❌ Connection failed: {e}")
+        if stand_in:
+            stand_in.close()
+        return
+
+    try:
+        run_diagnostics(ser)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+    finally:
+        ser.close()
+        if stand_in:
+            stand_in.close()
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--diag":
+        diagnostics(args[1] if len(args) > 1 else '/dev/cu.usbserial-0001')
+        return
+
+    print("="*60)
+    print("🧪 JARVIS CONNECTION TEST")
+    print("="*60)
+    print()
+    
+    # Try to import serial
+    serial_available = check_pyserial()
     
     # Try to import TTS
     try:
@@ -43,8 +407,10 @@ def main():
         print("  python3 -m pip install --user pyserial pyttsx3")
         return
     
+    import serial
+    
     # Test ESP32 connection
-    port = sys.argv[1] if len(sys.argv) > 1 else '/dev/cu.usbserial-0001'
+    port = args[0] if args else '/dev/cu.usbserial-0001'
     print(f"\n📡 Attempting to connect to: {port}")
     
     try:
@@ -58,7 +424,6 @@ def main():
         ser.write(f"{test_command}\n".encode())
         
         # Wait for response
-        import time
         time.sleep(1)
         
         if ser.in_waiting:
@@ -78,6 +443,8 @@ def main():
         print("   pip3 install --user pyttsx3")
         print("2. Run the full test:")
         print("   python3 jarvis-brain-test.py")
+        print("3. Check link quality:")
+        print(f"   python3 simple-test.py --diag {port}")
         
     except serial.SerialException as e:
         print(f"❌ Connection failed: {e}")